@@ -2,7 +2,6 @@
 # ruff: noqa: F541 E701
 # Repository: https://github.com/gphg/py100mbify
 
-import argparse
 import subprocess
 import os
 import sys
@@ -11,7 +10,15 @@ import json
 import time
 import math
 import shlex
+import signal
 import re
+import uuid
+import hashlib
+import tempfile
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 
 # --- Script Configuration ---
@@ -19,8 +26,93 @@ REQUIRED_COMMANDS = ["ffprobe", "ffmpeg"]
 DEFAULT_TARGET_SIZE_MIB = 100
 DEFAULT_AUDIO_BITRATE_KBPS = 192
 MIN_VIDEO_BITRATE_KBPS = 50
+CONTAINER_OVERHEAD_FRACTION = 0.01
+MIB_TO_BITS = 8 << 20
 DEFAULT_THREADS = 4
-DEFAULT_QUALITY = "best"
+DEFAULT_QUALITY = "good"
+DEFAULT_SPEED_PASS1 = 4
+DEFAULT_SPEED_PASS2 = 1
+
+# Defaults for every optional keyword argument accepted by compress_video().
+# Library callers (e.g. scene_runner) can pass only the options they care
+# about; anything omitted falls back to the CLI default.
+COMPRESS_DEFAULTS = {
+    "output_file": None,
+    "size": float(DEFAULT_TARGET_SIZE_MIB),
+    "audio_bitrate": DEFAULT_AUDIO_BITRATE_KBPS,
+    "mute": False,
+    "segment": None,
+    "start": None,
+    "end": None,
+    "speed": 1.0,
+    "fps": None,
+    "scale": None,
+    "scaler": None,
+    "rotate": None,
+    "hard_sub": False,
+    "target_web": False,
+    "keep_metadata": False,
+    "prepend_filters": None,
+    "append_filters": None,
+    "cpu_priority": None,
+    "proto": None,
+    "print_mode": False,
+    "threads": None,
+    "speed_pass1": None,
+    "speed_pass2": DEFAULT_SPEED_PASS2,
+    "quality": None,
+    "single_pass": False,
+    "crf": None,
+    "force_reencode": False,
+    "hwaccel": "none",
+    "codec": "vp9",
+    "parallel_chunks": None,
+    "fast_probe": False,
+    "quiet": False,
+    "min_twopass": 0.0,
+    # Library-only: a pre-fetched get_video_info() tuple. Batch drivers can
+    # probe the next file while the previous encode is still running.
+    "video_info": None,
+}
+
+# Only VP9 belongs in WebM; the other codecs get a Matroska container.
+CODEC_EXTENSIONS = {
+    "vp9": ".webm",
+    "av1-svt": ".mkv",
+    "av1-aom": ".mkv",
+    "x264": ".mkv",
+    "hevc-nvenc": ".mkv",
+    "vp9-vaapi": ".webm",
+}
+
+# GPU encoders have no libvpx-style two-pass mode; they always run single-pass.
+HARDWARE_CODECS = ("hevc-nvenc", "vp9-vaapi")
+
+
+def resolve_pass1_speed(requested):
+    """Resolves the analysis-pass -speed: CLI arg > env var > default."""
+    if requested is not None:
+        return requested
+    env_value = os.environ.get("PY100MBIFY_PASS1_SPEED")
+    if env_value:
+        try:
+            return int(env_value)
+        except ValueError:
+            print(f">>> Warning: Ignoring invalid PY100MBIFY_PASS1_SPEED value: {env_value!r}")
+    return DEFAULT_SPEED_PASS1
+
+
+def resolve_thread_count(requested):
+    """Resolves the encoder thread count: CLI arg > env var > CPU count."""
+    if requested:
+        return requested
+    env_threads = os.environ.get("PY100MBIFY_THREADS")
+    if env_threads:
+        try:
+            return int(env_threads)
+        except ValueError:
+            print(f">>> Warning: Ignoring invalid PY100MBIFY_THREADS value: {env_threads!r}")
+    return os.cpu_count() or DEFAULT_THREADS
 
 
 class ScriptError(Exception):
@@ -28,38 +120,65 @@ class ScriptError(Exception):
     pass
 
 
+# Optional fast JSON decoders for ffprobe output. Both parse bytes directly,
+# skipping the UTF-8 str round-trip the stdlib path would do.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        _json_loads = ujson.loads
+    except ImportError:
+        _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(cmd):
+    """Memoized shutil.which: each PATH scan walks and stats every entry."""
+    return shutil.which(cmd)
+
+
+_COMMANDS_CHECKED = set()
+
+
 def check_required_commands(commands):
-    """Check if all required commands are available."""
+    """Check if all required commands are available (once per process)."""
     for cmd in commands:
-        if not shutil.which(cmd):
+        if cmd in _COMMANDS_CHECKED:
+            continue
+        if not _which_cached(cmd):
             raise ScriptError(
                 f"Error: Required command '{cmd}' not found. Please install it."
             )
+        _COMMANDS_CHECKED.add(cmd)
+
+
+# Matches plain seconds, MM:SS and HH:MM:SS. The seconds group accepts every
+# fractional form float() does, including ".5" and "90.".
+_TIME_RE = re.compile(r"^(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d*)?|\.\d+)$")
 
 
 def get_time_in_seconds(time_str):
     """Converts HH:MM:SS.mmm or seconds to float."""
     if not time_str:
         return 0.0
-    try:
-        return float(time_str)
-    except ValueError:
-        parts = time_str.split(":")
-        if len(parts) == 3:
-            h, m, s = parts
-            return float(h) * 3600 + float(m) * 60 + float(s)
-        elif len(parts) == 2:
-            m, s = parts
-            return float(m) * 60 + float(s)
+    m = _TIME_RE.match(time_str)
+    if not m:
         return 0.0
+    hours, minutes, seconds = m.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
+
+
+# Single-scan escape table for FFmpeg filter strings (Windows safe).
+_FFMPEG_PATH_ESCAPES = str.maketrans({"\\": "/", ":": "\\:", "'": "'\\\\''"})
 
 
 def escape_ffmpeg_path(path):
     """Escapes file path for FFmpeg filter strings (Windows safe)."""
-    path = path.replace("\\", "/")
-    path = path.replace(":", "\\:")
-    path = path.replace("'", "'\\\\''")
-    return path
+    return path.translate(_FFMPEG_PATH_ESCAPES)
 
 
 def parse_srt_time(time_str):
@@ -136,51 +255,263 @@ def slice_and_shift_srt(input_srt, output_srt, segments):
         f.write("\n\n".join(new_blocks) + "\n")
 
 
+def _atempo_chain(speed):
+    """Builds the minimal atempo filter chain for an arbitrary speed factor.
+
+    A single atempo instance only accepts 0.5-2.0, so factors outside that
+    range are decomposed into doubling/halving stages plus one remainder,
+    with the stage count computed in closed form.
+    """
+    if speed <= 0:
+        raise ScriptError(f"Invalid speed factor: {speed}")
+    if 0.5 <= speed <= 2.0:
+        return f"atempo={speed:g}"
+    if speed > 2.0:
+        stage_count = math.floor(math.log2(speed))
+        remainder = speed / (2.0 ** stage_count)
+        stages = ["atempo=2.0"] * stage_count
+    else:
+        stage_count = math.floor(math.log(speed, 0.5))
+        remainder = speed / (0.5 ** stage_count)
+        stages = ["atempo=0.5"] * stage_count
+    if abs(remainder - 1.0) > 1e-9:
+        stages.append(f"atempo={remainder:g}")
+    return ",".join(stages)
+
+
+# On Windows, subprocess walks the whole inherited handle table when
+# close_fds is left at its default, adding real latency per launch; the
+# children only need stdio. POSIX keeps the default and its cheap
+# posix_spawn path.
+_SUBPROCESS_KWARGS = {"close_fds": False} if os.name == "nt" else {}
+
+
+def _creation_flags(priority):
+    """Windows creationflags applying the priority class at process spawn.
+
+    Cheaper than re-nicing after launch (and needs no psutil); returns 0 on
+    other platforms where creationflags is ignored.
+    """
+    if sys.platform != "win32" or not priority:
+        return 0
+    if priority == "low":
+        return getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+    if priority == "high":
+        return getattr(subprocess, "HIGH_PRIORITY_CLASS", 0)
+    return 0
+
+
 def set_process_priority(priority):
-    """Sets CPU priority for the current process and children (cross-platform)."""
-    if not priority:
+    """Sets CPU priority for the current process and children (POSIX).
+
+    Windows children get their priority class via _creation_flags at spawn
+    time instead, avoiding the former psutil dependency.
+    """
+    if not priority or sys.platform == "win32":
         return
     try:
-        if sys.platform == "win32":
-            import psutil
-
-            p = psutil.Process(os.getpid())
-            if priority == "low":
-                p.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
-            elif priority == "high":
-                p.nice(psutil.HIGH_PRIORITY_CLASS)
-        else:
-            if priority == "low":
-                os.nice(10)
+        if priority == "low":
+            os.nice(10)
+    except OSError:
+        pass
+
+
+PROBE_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "py100mbify",
+    "probe",
+)
+PROBE_CACHE_LIMIT = 256
+
+STATS_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "py100mbify",
+    "stats",
+)
+# Pass logs run to a few hundred KB per minute of video; keep fewer of them.
+STATS_CACHE_LIMIT = 64
+
+
+def _probe_cache_path(input_file):
+    """Derives the probe cache file; the key covers path, size and mtime."""
+    st = os.stat(input_file)
+    # The trailing number versions the cached tuple layout.
+    key = f"{os.path.abspath(input_file)}|{st.st_size}|{st.st_mtime_ns}|4"
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(PROBE_CACHE_DIR, f"{digest}.json")
+
+
+def _prune_probe_cache():
+    """Keeps the probe cache bounded by evicting the oldest entries."""
+    try:
+        entries = [e for e in os.scandir(PROBE_CACHE_DIR) if e.name.endswith(".json")]
+        if len(entries) <= PROBE_CACHE_LIMIT:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - PROBE_CACHE_LIMIT]:
+            os.remove(entry.path)
+    except OSError:
+        pass
+
+
+def get_video_info(input_file):
+    """Returns video metadata, using a content-keyed disk cache when possible.
+
+    Repeat runs on an unchanged file (parameter sweeps, batch reruns) skip the
+    ffprobe subprocess entirely. Set PY100MBIFY_NO_PROBE_CACHE to disable.
+    """
+    cache_path = None
+    if not os.environ.get("PY100MBIFY_NO_PROBE_CACHE"):
+        try:
+            cache_path = _probe_cache_path(input_file)
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return tuple(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    info = _probe_pyav(input_file)
+    if info is None:
+        info = _probe_video_info(input_file)
+
+    if cache_path:
+        try:
+            os.makedirs(PROBE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(info, f)
+            os.replace(tmp_path, cache_path)
+            _prune_probe_cache()
+        except OSError:
+            pass
+    return info
+
+
+def _stats_cache_path(args, segments):
+    """Derives the pass-1 stats cache file for the current job.
+
+    The key covers the input's identity and every option that changes the
+    frames the analysis pass sees. The target bitrate is deliberately
+    excluded: libvpx first-pass stats are per-frame complexity data, so a
+    size sweep over the same clip reuses one analysis run.
+    """
+    st = os.stat(args.input_file)
+    key = "|".join(
+        str(part)
+        for part in (
+            os.path.abspath(args.input_file), st.st_size, st.st_mtime_ns,
+            segments, args.speed, args.fps, args.scale, args.scaler,
+            args.rotate, args.hard_sub, args.prepend_filters,
+            args.append_filters, args.target_web, args.codec, 1,
+        )
+    )
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(STATS_CACHE_DIR, f"{digest}.log")
+
+
+def _prune_stats_cache():
+    """Keeps the stats cache bounded by evicting the oldest entries."""
+    try:
+        entries = [e for e in os.scandir(STATS_CACHE_DIR) if e.name.endswith(".log")]
+        if len(entries) <= STATS_CACHE_LIMIT:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - STATS_CACHE_LIMIT]:
+            os.remove(entry.path)
+            # Evict any x264 mbtree sidecar along with its log.
+            with contextlib.suppress(OSError):
+                os.remove(entry.path + ".mbtree")
+    except OSError:
+        pass
+
+
+def _probe_pyav(input_file):
+    """Probes via PyAV (libavformat in-process) when installed.
+
+    Skips the fork/exec + JSON round-trip of ffprobe entirely. Returns the
+    same tuple as _probe_video_info, or None when PyAV is missing or cannot
+    read the file (the ffprobe path then takes over).
+    """
+    try:
+        import av
     except ImportError:
-        if priority:
-            print(
-                ">>> Warning: 'psutil' is required for CPU priority on Windows. Install with 'pip install psutil'."
+        return None
+    try:
+        with av.open(input_file) as container:
+            video = next(
+                (s for s in container.streams if s.type == "video"), None
+            )
+            if video is None:
+                return None
+            duration = (container.duration or 0) / 1_000_000
+            width = video.codec_context.width or 0
+            height = video.codec_context.height or 0
+            fps = float(video.base_rate) if video.base_rate else 30.0
+            avg_fps = float(video.average_rate) if video.average_rate else fps
+            audio_streams = [
+                {"codec_type": "audio", "codec_name": s.codec_context.name,
+                 "bit_rate": s.bit_rate}
+                for s in container.streams
+                if s.type == "audio"
+            ]
+            is_vfr = abs(fps - avg_fps) > 0.05
+            source_bitrate_kbps = (container.bit_rate or 0) / 1000 or None
+            video_codec = video.codec_context.name
+            return (
+                duration, width, height, fps, audio_streams, is_vfr,
+                source_bitrate_kbps, video_codec,
             )
+    except Exception:
+        return None
+
+
+def _parse_frame_rate(rate_str):
+    """Parses ffprobe's "num/den" rational frame rate, defaulting to 30.0."""
+    num, _, den = rate_str.partition("/")
+    if den and den != "0":
+        return float(num) / float(den)
+    return 30.0
+
+
+def _ffprobe_json(input_file, fast):
+    """Runs ffprobe and returns the parsed JSON payload."""
+    cmd = ["ffprobe", "-v", "quiet"]
+    if fast:
+        # Cap header analysis at 1 MB / 1 s: local files with sane headers
+        # never need the 5 MB default scan, and the probe runs per job.
+        cmd.extend(["-probesize", "1M", "-analyzeduration", "1M"])
+    # Only request the fields we actually read; -show_format/-show_streams
+    # would emit (and force us to parse) every tag and disposition.
+    cmd.extend([
+        "-print_format",
+        "json",
+        "-show_entries",
+        "format=duration,bit_rate:stream=codec_type,codec_name,bit_rate,width,height,r_frame_rate,avg_frame_rate",
+        input_file,
+    ])
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        check=True,
+        **_SUBPROCESS_KWARGS,
+    )
+    try:
+        return _json_loads(result.stdout)
+    except ValueError:
+        # Fallback for malformed UTF-8 in metadata (Windows-safe).
+        return json.loads(result.stdout.decode("utf-8", errors="replace"))
 
 
-def get_video_info(input_file):
+def _probe_video_info(input_file):
     """Capture video metadata with Windows-safe encoding."""
     try:
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            "-show_streams",
-            input_file,
-        ]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        probe = json.loads(result.stdout)
+        try:
+            probe = _ffprobe_json(input_file, fast=True)
+            if not probe.get("streams"):
+                raise ValueError("capped probe returned no streams")
+        except (ValueError, subprocess.CalledProcessError):
+            # Unusual headers (ID3 padding, fragmented MP4) can defeat the
+            # capped scan; retry once with ffprobe's defaults.
+            probe = _ffprobe_json(input_file, fast=False)
         duration = float(probe["format"].get("duration", 0))
 
         video_stream = next(
@@ -191,52 +522,124 @@ def get_video_info(input_file):
 
         width, height = video_stream.get("width", 0), video_stream.get("height", 0)
 
-        fps_raw = video_stream.get("r_frame_rate", "0/1").split("/")
-        avg_fps_raw = video_stream.get("avg_frame_rate", "0/1").split("/")
-        fps = float(fps_raw[0]) / float(fps_raw[1]) if int(fps_raw[1]) > 0 else 30.0
-        avg_fps = float(avg_fps_raw[0]) / float(avg_fps_raw[1]) if int(avg_fps_raw[1]) > 0 else 30.0
+        fps = _parse_frame_rate(video_stream.get("r_frame_rate", "0/1"))
+        avg_fps = _parse_frame_rate(video_stream.get("avg_frame_rate", "0/1"))
 
         audio_streams = [s for s in probe["streams"] if s["codec_type"] == "audio"]
 
         # If the difference is more than a tiny fraction, it's VFR
         is_vfr = abs(fps - avg_fps) > 0.05
 
-        return duration, width, height, fps, audio_streams, is_vfr
+        source_bitrate_kbps = float(probe["format"].get("bit_rate", 0)) / 1000 or None
+        video_codec = video_stream.get("codec_name")
+
+        return duration, width, height, fps, audio_streams, is_vfr, source_bitrate_kbps, video_codec
     except Exception as e:
         raise ScriptError(f"ffprobe failed to read file: {e}")
 
 
-def calculate_bitrates(size_mib, effective_duration, audio_kbps, is_audio_enabled):
+def calculate_bitrates(size_mib, effective_duration, audio_kbps, is_audio_enabled,
+                       source_bitrate_kbps=None, overhead_fraction=None):
     """
-    Returns (total_bitrate_kbps, video_bitrate_kbps).
-    Includes a 5% safety margin for container overhead.
+    Returns (total_bitrate_kbps, video_bitrate_kbps) as integers, rounded
+    down so float drift can never push the result past the target size.
+    Discounts container overhead (EBML framing, headers), caps the video
+    bitrate at the source's own rate when known, and raises ScriptError when
+    the target size cannot fit a usable video stream. The overhead reserve
+    resolves explicit argument > PY100MBIFY_OVERHEAD > the 1% default, which
+    measures slightly conservative for WebM (VP9/Opus muxes ~0.5-1%).
     """
-    target_bits = size_mib * 8 * 1024 * 1024
-    total_bitrate = (target_bits / effective_duration) * 0.95 / 1000
+    overhead = overhead_fraction
+    if overhead is None:
+        env_value = os.environ.get("PY100MBIFY_OVERHEAD")
+        if env_value:
+            try:
+                overhead = float(env_value)
+            except ValueError:
+                print(f">>> Warning: Ignoring invalid PY100MBIFY_OVERHEAD value: {env_value!r}")
+    if overhead is None:
+        overhead = CONTAINER_OVERHEAD_FRACTION
+    target_bits = int(size_mib * MIB_TO_BITS)
+    usable_bits = int(target_bits * (1 - overhead))
+    # bits per millisecond == kbit per second, with // flooring the result.
+    total_bitrate = usable_bits // int(effective_duration * 1000)
     actual_audio = audio_kbps if is_audio_enabled else 0
-    video_bitrate = max(MIN_VIDEO_BITRATE_KBPS, total_bitrate - actual_audio)
+    video_bitrate = total_bitrate - actual_audio
+    if video_bitrate < MIN_VIDEO_BITRATE_KBPS:
+        raise ScriptError(
+            f"Target of {size_mib} MiB over {effective_duration:.1f}s leaves only "
+            f"{video_bitrate:.0f}k for video (minimum {MIN_VIDEO_BITRATE_KBPS}k). "
+            "Raise --size, lower --audio-bitrate, or shorten the clip."
+        )
+    if source_bitrate_kbps and video_bitrate > source_bitrate_kbps:
+        # Don't inflate above the source material; extra bits buy nothing.
+        print(
+            f">>> Info: Capping video bitrate at the source's {source_bitrate_kbps:.0f}k "
+            f"(target allowed {video_bitrate:.0f}k). Output will be under target size."
+        )
+        video_bitrate = source_bitrate_kbps
     return total_bitrate, video_bitrate
 
 
-def run_ffmpeg_pass(pass_number, args_obj, cfg):
-    """Executes a single FFmpeg pass based on provided configuration."""
-    cmd = ["ffmpeg", "-hide_banner", "-y", "-nostdin", "-stats"]
+_HWACCELS_CACHE = None
 
-    # Native video input mapping
-    cmd.extend(["-i", args_obj.input_file])
 
-    if not cfg.get("filter_complex"):
-        # Accurate Seeking optimization for single segment cuts
-        single_start = cfg["segments"][0][0]
-        single_duration = cfg["segments"][0][1] - single_start
+def get_available_hwaccels():
+    """Returns the hwaccel methods supported by the installed ffmpeg build."""
+    global _HWACCELS_CACHE
+    if _HWACCELS_CACHE is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-hwaccels"],
+                capture_output=True,
+                text=True,
+            )
+            _HWACCELS_CACHE = {
+                line.strip() for line in result.stdout.splitlines() if line.strip()
+            }
+            _HWACCELS_CACHE.discard("Hardware acceleration methods:")
+        except OSError:
+            _HWACCELS_CACHE = set()
+    return _HWACCELS_CACHE
+
+
+def build_concat_filter(segments, with_audio):
+    """Builds a trim/concat filter graph for multi-segment slicing."""
+    concat_nodes = ""
+    f_parts = []
+    for i, (st, en) in enumerate(segments):
+        f_parts.append(f"[0:v]trim=start={st:.3f}:end={en:.3f},setpts=PTS-STARTPTS[v{i}]")
+        if with_audio:
+            f_parts.append(f"[0:a]atrim=start={st:.3f}:end={en:.3f},asetpts=PTS-STARTPTS[a{i}]")
+            concat_nodes += f"[v{i}][a{i}]"
+        else:
+            concat_nodes += f"[v{i}]"
 
-        if single_start > 0:
-            cmd.extend(["-ss", f"{single_start:.3f}"])
+    c_ext = f":a=1[vseg][aseg]" if with_audio else ":a=0[vseg]"
+    f_parts.append(f"{concat_nodes}concat=n={len(segments)}:v=1{c_ext}")
+    return ";".join(f_parts)
 
-        # Compare against the raw duration of the source file
-        if single_duration > 0 and single_duration < cfg.get("raw_duration", float('inf')):
-            cmd.extend(["-t", f"{single_duration:.3f}"])
 
+def resolution_bitrate_ceiling(width, height, fps):
+    """Returns a quality-saturation ceiling in kbps for VP9-class codecs.
+
+    Past roughly these bits-per-pixel rates extra bitrate stops buying visible
+    quality; larger frames compress more efficiently, so the rate tapers off.
+    """
+    pixels = width * height
+    if pixels >= 3840 * 2160:
+        bits_per_pixel = 0.07
+    elif pixels >= 1920 * 1080:
+        bits_per_pixel = 0.09
+    elif pixels >= 1280 * 720:
+        bits_per_pixel = 0.11
+    else:
+        bits_per_pixel = 0.15
+    return pixels * fps * bits_per_pixel / 1000
+
+
+def build_video_filters(args_obj, cfg):
+    """Builds the video filter chain shared by both encoding passes."""
     v_filters = []
     if args_obj.prepend_filters:
         v_filters.append(args_obj.prepend_filters)
@@ -246,7 +649,6 @@ def run_ffmpeg_pass(pass_number, args_obj, cfg):
         # FFmpeg on Windows requires the colon in the drive letter to be escaped
         safe_sub_path = os.path.abspath(cfg["adjusted_srt"]).replace("\\", "/").replace(":", "\\:")
         v_filters.append(f"subtitles='{safe_sub_path}'")
-        cmd.append("-sn")
 
     if args_obj.rotate:
         rad = math.radians(args_obj.rotate)
@@ -283,9 +685,132 @@ def run_ffmpeg_pass(pass_number, args_obj, cfg):
     if args_obj.append_filters:
         v_filters.append(args_obj.append_filters)
 
+    return v_filters
+
+
+def _prefilter_to_tempfile(args_obj, cfg, out_dir, timestamp):
+    """Decodes and filters the source once into a lossless intermediate.
+
+    Two-pass encoding otherwise decodes and filters every frame twice; for
+    heavy chains (rotate, scale, burned subtitles) a single ffv1 + pcm_s16le
+    pre-render pays for itself. Opt-in via PY100MBIFY_PREFILTER=1 because the
+    intermediate can be very large.
+    """
+    temp_path = os.path.join(
+        out_dir, f"prefilter_{timestamp}_{uuid.uuid4().hex[:8]}.mkv"
+    ).replace("\\", "/")
+    cmd = ["ffmpeg", "-hide_banner", "-y", "-nostdin"]
+
+    # Input-side seek, same reasoning as in run_ffmpeg_pass.
+    single_start = cfg["segments"][0][0]
+    single_duration = cfg["segments"][0][1] - single_start
+    if single_start > 0:
+        cmd.extend(["-ss", f"{single_start:.3f}"])
+    if single_duration > 0 and single_duration < cfg.get("raw_duration", float('inf')):
+        cmd.extend(["-t", f"{single_duration:.3f}"])
+    cmd.extend(["-i", args_obj.input_file])
+
+    v_filters = cfg["v_filters"]
+    if v_filters:
+        cmd.extend(["-vf", ",".join(v_filters)])
+    if args_obj.hard_sub and cfg.get("adjusted_srt"):
+        cmd.append("-sn")
+
+    cmd.extend(["-c:v", "ffv1", "-level", "3"])
+    cmd.extend(["-threads", str(resolve_thread_count(args_obj.threads))])
+
+    if args_obj.mute or not cfg["has_audio"]:
+        cmd.append("-an")
+    else:
+        if cfg.get("atempo_filter"):
+            cmd.extend(["-filter:a", cfg["atempo_filter"]])
+        cmd.extend(["-c:a", "pcm_s16le"])
+    cmd.extend(["-dn", temp_path])
+
+    print(">>> Info: Pre-rendering filters to a lossless intermediate (PY100MBIFY_PREFILTER)...")
+    try:
+        subprocess.run(
+            cmd,
+            check=True,
+            creationflags=_creation_flags(args_obj.cpu_priority),
+            **_SUBPROCESS_KWARGS,
+        )
+    except subprocess.CalledProcessError as e:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise ScriptError(f"FFmpeg pre-filter pass failed with exit code {e.returncode}")
+    return temp_path
+
+
+def run_ffmpeg_pass(pass_number, args_obj, cfg):
+    """Executes a single FFmpeg pass based on provided configuration."""
+    # Structured progress on stdout instead of the stderr stats spam; parsed
+    # below to print 10% milestones against the effective duration.
+    cmd = ["ffmpeg", "-hide_banner", "-y", "-nostdin", "-nostats", "-progress", "pipe:1"]
+    # Input options (must precede -i): the probe already validated the file,
+    # so cap ffmpeg's own header analysis instead of letting it re-scan 5s.
+    # --fast-probe tightens this to the bare minimum for well-formed sources
+    # (scene batches over one known file pay this per pass per scene).
+    if args_obj.fast_probe:
+        cmd.extend(["-probesize", "1M", "-analyzeduration", "0", "-fpsprobesize", "0"])
+    else:
+        cmd.extend(["-probesize", "5M", "-analyzeduration", "5M"])
+
+    # The analysis pass only produces stats: audio, subtitle and data
+    # streams are dead weight there.
+    analysis_pass = (
+        pass_number == 1 and not args_obj.proto and not args_obj.single_pass
+    )
+
+    codec = args_obj.codec or "vp9"
+
+    # VAAPI encoding needs the device opened before -i and the frames
+    # uploaded to GPU memory at the end of the filter chain.
+    if codec == "vp9-vaapi":
+        vaapi_device = os.environ.get("PY100MBIFY_VAAPI_DEVICE", "/dev/dri/renderD128")
+        cmd.extend(["-init_hw_device", f"vaapi=va:{vaapi_device}", "-filter_hw_device", "va"])
+
+    # Hardware-accelerated decode (input option: must precede -i). Frames are
+    # downloaded back to system memory for the software VP9 encoder/filters.
+    if args_obj.hwaccel and args_obj.hwaccel != "none":
+        if args_obj.hwaccel == "auto" or args_obj.hwaccel in get_available_hwaccels():
+            cmd.extend(["-hwaccel", args_obj.hwaccel])
+        else:
+            print(
+                f">>> Warning: hwaccel '{args_obj.hwaccel}' not available in this "
+                "ffmpeg build. Using software decode."
+            )
+
+    if not cfg.get("filter_complex"):
+        # Input-side seek for single segment cuts: the demuxer jumps to the
+        # nearest keyframe and decodes forward to the exact point, instead of
+        # decoding (and discarding) everything before the start. Still
+        # frame-accurate when re-encoding, and timestamps restart at zero,
+        # which is what the pre-sliced SRT already assumes.
+        single_start = cfg["segments"][0][0]
+        single_duration = cfg["segments"][0][1] - single_start
+
+        if single_start > 0:
+            cmd.extend(["-ss", f"{single_start:.3f}"])
+
+        # Compare against the raw duration of the source file
+        if single_duration > 0 and single_duration < cfg.get("raw_duration", float('inf')):
+            cmd.extend(["-t", f"{single_duration:.3f}"])
+
+    # Native video input mapping
+    cmd.extend(["-i", args_obj.input_file])
+
+    v_filters = cfg["v_filters"]
+    if codec == "vp9-vaapi":
+        # Copy, not append: cfg["v_filters"] is shared across passes.
+        v_filters = v_filters + ["format=nv12,hwupload"]
+    if args_obj.hard_sub and cfg.get("adjusted_srt"):
+        cmd.append("-sn")
+
     # Routing Filter Complex graphs safely alongside optional parameter expansions
     if cfg.get("filter_complex"):
-        fc_str = cfg["filter_complex"]
+        # The analysis pass drops audio, so use the video-only graph there.
+        fc_str = cfg["filter_complex_video"] if analysis_pass else cfg["filter_complex"]
         current_video_node = "[vseg]"
         if v_filters:
             fc_str += f";{current_video_node}{','.join(v_filters)}[vfinal]"
@@ -300,7 +825,24 @@ def run_ffmpeg_pass(pass_number, args_obj, cfg):
         audio_map = "0:a:0" if cfg["has_audio"] and not args_obj.mute else None
 
     # Codec Settings
-    cmd.extend(["-c:v", "libvpx-vp9", "-row-mt", "1"])
+    threads = resolve_thread_count(args_obj.threads)
+    if codec == "vp9":
+        cmd.extend(["-c:v", "libvpx-vp9", "-row-mt", "1"])
+        # Tile-based parallelism so libvpx can actually use the threads we
+        # give it. -tile-columns is log2: match it to the thread count, since
+        # excess tiles past the thread count only cost coding efficiency.
+        tile_columns = min(6, max(0, threads.bit_length() - 1))
+        cmd.extend(["-tile-columns", str(tile_columns), "-frame-parallel", "1"])
+    elif codec == "av1-svt":
+        cmd.extend(["-c:v", "libsvtav1", "-preset", "8", "-svtav1-params", "tune=0"])
+    elif codec == "av1-aom":
+        cmd.extend(["-c:v", "libaom-av1", "-row-mt", "1", "-tile-columns", "2"])
+    elif codec == "x264":
+        cmd.extend(["-c:v", "libx264", "-preset", "slow"])
+    elif codec == "hevc-nvenc":
+        cmd.extend(["-c:v", "hevc_nvenc", "-preset", "p5", "-rc", "vbr"])
+    elif codec == "vp9-vaapi":
+        cmd.extend(["-c:v", "vp9_vaapi"])
     if cfg["effective_duration"] < 10.0:
         # Optimized GOP for short clips
         fps_str = str(int(args_obj.fps or cfg["src_fps"]))
@@ -309,50 +851,88 @@ def run_ffmpeg_pass(pass_number, args_obj, cfg):
         cmd.extend(["-keyint_min", "150", "-g", "150"])
 
     if args_obj.target_web:
-        cmd.extend(["-pix_fmt", "yuv420p", "-profile:v", "0"])
+        cmd.extend(["-pix_fmt", "yuv420p"])
+        if codec == "vp9":
+            cmd.extend(["-profile:v", "0"])
 
     if args_obj.proto:
-        cmd.extend(
-            [
-                "-crf",
-                str(args_obj.proto),
-                "-b:v",
-                "0",
-                "-quality",
-                "realtime",
-                "-speed",
-                "4",
-            ]
-        )
+        # The hardware encoders have no -crf; use their equivalent
+        # constant-quality knobs for the prototype value.
+        if codec == "hevc-nvenc":
+            cmd.extend(["-cq", str(args_obj.proto)])
+        elif codec == "vp9-vaapi":
+            cmd.extend(["-qp", str(args_obj.proto)])
+        else:
+            cmd.extend(["-crf", str(args_obj.proto)])
+        if codec in ("vp9", "av1-aom"):
+            cmd.extend(["-b:v", "0"])
+        if codec == "vp9":
+            cmd.extend(["-deadline", "realtime", "-speed", "4"])
     else:
-        cmd.extend(
-            [
-                "-b:v",
-                f"{cfg['video_bitrate']:.0f}k",
-                "-pass",
-                str(pass_number),
-                "-passlogfile",
-                cfg["log_prefix"],
-            ]
-        )
-        cmd.extend(["-quality", os.environ.get("PY100MBIFY_QUALITY", DEFAULT_QUALITY)])
+        vb = cfg["video_bitrate"]
+        cmd.extend(["-b:v", f"{vb:.0f}k"])
+        if args_obj.single_pass:
+            # Constrained VBR in one pass: close to target size at half the
+            # wall time, without the exact-size fidelity of two-pass.
+            cmd.extend(
+                [
+                    "-minrate", f"{vb * 0.5:.0f}k",
+                    "-maxrate", f"{vb * 1.45:.0f}k",
+                    "-bufsize", f"{vb * 2:.0f}k",
+                ]
+            )
+            if args_obj.crf:
+                # Constrained quality: CRF sets the floor, -b:v/-maxrate cap it.
+                cmd.extend(["-crf", str(args_obj.crf)])
+        else:
+            cmd.extend(["-pass", str(pass_number), "-passlogfile", cfg["log_prefix"]])
+        if codec == "vp9":
+            # "best" forces a near single-threaded code path in many libvpx
+            # builds; "good" is the intended quality/speed compromise.
+            quality = args_obj.quality or os.environ.get("PY100MBIFY_QUALITY", DEFAULT_QUALITY)
+            cmd.extend(["-deadline", quality])
+            if pass_number == 1 and not args_obj.single_pass:
+                # Fast analysis pass: stats quality is insensitive to -speed.
+                cmd.extend(["-speed", str(resolve_pass1_speed(args_obj.speed_pass1))])
+            else:
+                cmd.extend(["-speed", str(args_obj.speed_pass2)])
+                cmd.extend(["-auto-alt-ref", "1", "-lag-in-frames", "25"])
+        elif codec == "av1-aom":
+            if pass_number == 1 and not args_obj.single_pass:
+                cmd.extend(["-cpu-used", str(resolve_pass1_speed(args_obj.speed_pass1))])
+            else:
+                cmd.extend(["-cpu-used", str(args_obj.speed_pass2)])
 
     # Threading
-    cmd.extend(["-threads", os.environ.get("PY100MBIFY_THREADS", str(DEFAULT_THREADS))])
+    cmd.extend(["-threads", str(threads)])
 
     # Route explicit map stream nodes
     cmd.extend(["-map", video_map])
 
-    if args_obj.mute or not cfg["has_audio"] or not audio_map:
+    if analysis_pass:
+        cmd.extend(["-an", "-dn"])
+        if "-sn" not in cmd:
+            cmd.append("-sn")
+    elif args_obj.mute or not cfg["has_audio"] or not audio_map:
         cmd.append("-an")
     else:
         cmd.extend(["-map", audio_map])
-        cmd.extend(["-c:a", "libopus", "-b:a", f"{args_obj.audio_bitrate}k", "-ac", "2"])
+        if cfg.get("atempo_filter") and not cfg.get("filter_complex"):
+            cmd.extend(["-filter:a", cfg["atempo_filter"]])
+        if cfg.get("audio_copy"):
+            cmd.extend(["-c:a", "copy"])
+        else:
+            cmd.extend(["-c:a", "libopus", "-b:a", f"{args_obj.audio_bitrate}k", "-ac", "2"])
 
     out_path = cfg["out_path"]
-    if not args_obj.proto and pass_number == 1:
-        cmd.extend(["-f", "webm", "NUL" if sys.platform == "win32" else "/dev/null"])
+    if analysis_pass:
+        # The null muxer discards packets without building container bytes;
+        # the pass stats go to -passlogfile regardless.
+        cmd.extend(["-f", "null", "-"])
     else:
+        # Explicit -map already excludes subtitle/data streams; -dn also
+        # stops muxers from attaching implicit data tracks (timecodes etc.).
+        cmd.append("-dn")
         if args_obj.keep_metadata:
             cmd.extend(["-map_metadata", "0"])
         cmd.append(out_path)
@@ -361,29 +941,193 @@ def run_ffmpeg_pass(pass_number, args_obj, cfg):
         print(f"\n# Pass {pass_number} command:\n{shlex.join(cmd)}")
         return
 
-    label = "Prototype" if args_obj.proto else f"Pass {pass_number}"
+    if args_obj.proto:
+        label = "Prototype"
+    elif args_obj.single_pass:
+        label = "Single Pass"
+    else:
+        label = f"Pass {pass_number}"
     print(f"\n>>> [{datetime.now().strftime('%H:%M:%S')}] Starting {label}...")
     start_t = time.time()
+    total_us = cfg["effective_duration"] * 1_000_000
+    process = None
     try:
-        subprocess.run(cmd, check=True)
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            # ffmpeg warnings go to stderr; --quiet drops them so parallel
+            # workers don't interleave noise through the parent terminal.
+            stderr=subprocess.DEVNULL if args_obj.quiet else None,
+            text=True,
+            # A generous pipe buffer keeps bursty -progress writes from
+            # stalling ffmpeg when the parent is busy with other workers.
+            bufsize=1 << 20,
+            creationflags=_creation_flags(args_obj.cpu_priority),
+            **_SUBPROCESS_KWARGS,
+        )
+        last_decile = -1
+        for line in process.stdout:
+            # out_time_us/out_time_ms are both microseconds (ffmpeg quirk).
+            if line.startswith("out_time_us=") or line.startswith("out_time_ms="):
+                try:
+                    out_us = int(line.split("=", 1)[1])
+                except ValueError:
+                    continue
+                if total_us <= 0:
+                    continue
+                decile = min(10, int(out_us * 10 / total_us))
+                if args_obj.quiet:
+                    continue
+                if decile > last_decile:
+                    last_decile = decile
+                    print(
+                        f">>> {label}: {decile * 10}% "
+                        f"({out_us / 1_000_000:.1f}s / {cfg['effective_duration']:.1f}s)"
+                    )
+        if process.wait() != 0:
+            raise ScriptError(f"FFmpeg {label} failed with exit code {process.returncode}")
         elapsed = time.time() - start_t
         print(f">>> {label} completed in {elapsed:.2f}s")
-    except subprocess.CalledProcessError as e:
-        raise ScriptError(f"FFmpeg {label} failed with exit code {e.returncode}")
+    except KeyboardInterrupt:
+        # Give ffmpeg a chance to finalize its output before forcing it down:
+        # SIGINT lets it flush trailers/stats, then escalate.
+        print(f"\n>>> Interrupted: stopping FFmpeg {label}...")
+        if process is None:
+            raise
+        try:
+            # Windows' Popen.send_signal rejects SIGINT with ValueError;
+            # terminate() there still lets the escalation below run.
+            if os.name == "nt":
+                process.terminate()
+            else:
+                process.send_signal(signal.SIGINT)
+            process.wait(timeout=2)
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            process.terminate()
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        raise
+    except OSError as e:
+        raise ScriptError(f"FFmpeg {label} failed to start: {e}")
+
+
+def _compress_in_parallel_chunks(args, segments, out_path, out_dir):
+    """Encodes N time slices of the clip concurrently, then concatenates.
+
+    libvpx pass-1 stats are per-frame, so slicing the timeline costs only a
+    small efficiency penalty at chunk boundaries while the wall time drops
+    nearly linearly with worker count on long inputs.
+    """
+    n = args.parallel_chunks
+    if len(segments) > 1 or args.proto:
+        raise ScriptError(
+            "--parallel-chunks needs a single continuous segment and cannot be "
+            "combined with --proto."
+        )
+    seg_start, seg_end = segments[0]
+    chunk_len = (seg_end - seg_start) / n
+    token = uuid.uuid4().hex[:8]
+    ext = os.path.splitext(out_path)[1] or ".webm"
+
+    jobs = []
+    chunk_paths = []
+    for i in range(n):
+        st = seg_start + i * chunk_len
+        en = seg_end if i == n - 1 else seg_start + (i + 1) * chunk_len
+        chunk_out = os.path.join(out_dir, f"chunk_{token}_{i:03d}{ext}")
+        chunk_paths.append(chunk_out)
+        kwargs = dict(vars(args))
+        kwargs.update(
+            output_file=chunk_out,
+            start=f"{st:.3f}",
+            end=f"{en:.3f}",
+            size=args.size / n,
+            segment=None,
+            parallel_chunks=None,
+            # Stream-copied chunks would snap to keyframes and leave gaps at
+            # the seams; every slice must be a frame-accurate re-encode.
+            force_reencode=True,
+        )
+        jobs.append(kwargs)
 
+    print(f">>> Info: Encoding {n} chunks in parallel ({chunk_len:.1f}s each)...")
+    list_path = os.path.join(out_dir, f"chunks_{token}.txt")
+    try:
+        failures = []
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            futures = {
+                pool.submit(compress_video, **kw): kw["output_file"] for kw in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append(f"{os.path.basename(futures[future])}: {e}")
+        if failures:
+            raise ScriptError(
+                "Parallel chunk encoding failed:\n" + "\n".join(failures)
+            )
 
-def compress_video(**kwargs):
-    """Core compression logic with improved reporting and modularity."""
-    args = argparse.Namespace(**kwargs)
+        with open(list_path, "w", encoding="utf-8") as f:
+            for p in chunk_paths:
+                f.write(f"file '{os.path.abspath(p)}'\n")
+        concat_cmd = [
+            "ffmpeg", "-hide_banner", "-y", "-nostdin",
+            "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", out_path,
+        ]
+        try:
+            subprocess.run(concat_cmd, check=True, **_SUBPROCESS_KWARGS)
+        except subprocess.CalledProcessError as e:
+            raise ScriptError(f"FFmpeg concat failed with exit code {e.returncode}")
+    finally:
+        for f in chunk_paths + [list_path]:
+            with contextlib.suppress(OSError):
+                os.remove(f)
 
-    check_required_commands(REQUIRED_COMMANDS)
-    set_process_priority(args.cpu_priority)
+    try:
+        final_size = os.stat(out_path).st_size / (1024 * 1024)
+        print(f">>> Concatenated {n} chunks -> {out_path} ({final_size:.2f} MiB)")
+    except OSError:
+        pass
 
-    script_start_time = time.time()
-    start_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    timestamp = int(script_start_time)
 
-    duration, w, h, fps, audio, is_vfr = get_video_info(args.input_file)
+def compress_video(**kwargs):
+    """Core compression logic with improved reporting and modularity."""
+    for key, value in COMPRESS_DEFAULTS.items():
+        kwargs.setdefault(key, value)
+    args = SimpleNamespace(**kwargs)
+
+    # Overlap the ffprobe subprocess with the prerequisite checks; the probe
+    # result is only needed once the segment list is built.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        probe_future = None
+        if args.video_info is None:
+            probe_future = pool.submit(get_video_info, args.input_file)
+
+        check_required_commands(REQUIRED_COMMANDS)
+        set_process_priority(args.cpu_priority)
+
+        script_start_time = time.time()
+        start_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = int(script_start_time)
+
+        info = probe_future.result() if probe_future else tuple(args.video_info)
+        duration, w, h, fps, audio, is_vfr, source_bitrate_kbps, video_codec = info
+
+    # --crf implies constrained-quality single-pass encoding. The env var
+    # lets batch/CI wrappers flip every job to single-pass without plumbing
+    # the flag through.
+    if args.crf or os.environ.get("PY100MBIFY_SINGLEPASS"):
+        args.single_pass = True
+
+    if args.codec in HARDWARE_CODECS and not args.proto and not args.single_pass:
+        print(
+            f">>> Info: {args.codec} has no two-pass mode; using single-pass "
+            "constrained VBR."
+        )
+        args.single_pass = True
 
     # Build the segment list
     segments = []
@@ -406,11 +1150,29 @@ def compress_video(**kwargs):
             "Effective duration is zero or negative. Check your segment parameters."
         )
 
+    # For very short clips the analysis pass costs more CPU than it recovers;
+    # below the (opt-in) threshold, fall back to constrained-VBR single pass.
+    if (
+        args.min_twopass
+        and not args.proto
+        and not args.single_pass
+        and effective_duration < args.min_twopass
+    ):
+        print(
+            f">>> Info: Clip is under {args.min_twopass:g}s; using single-pass "
+            "constrained VBR (--min-twopass)."
+        )
+        args.single_pass = True
+
+    # Decompose the paths once; the basenames and abspaths are reused by the
+    # header, temp-file naming and the history log below.
+    input_name = os.path.basename(args.input_file)
+
     if args.output_file:
         out_path = args.output_file
     else:
-        base_filename = os.path.splitext(os.path.basename(args.input_file))[0]
-        out_path = f"{base_filename}.webm"
+        base_filename = os.path.splitext(input_name)[0]
+        out_path = base_filename + CODEC_EXTENSIONS.get(args.codec, ".webm")
 
     out_dir = os.path.dirname(os.path.abspath(out_path))
 
@@ -419,6 +1181,64 @@ def compress_video(**kwargs):
             f"Output path is the same as input path: {out_path}. Please specify a different output name."
         )
 
+    # Stream-copy fast path: when the source already fits the target and no
+    # option forces a re-encode, remuxing is thousands of times faster.
+    wants_transform = (
+        args.scale or args.fps or args.rotate or args.hard_sub or args.target_web
+        or args.prepend_filters or args.append_filters or args.speed != 1.0
+        or len(segments) > 1 or args.proto or args.crf
+    )
+    source_fits = os.path.getsize(args.input_file) <= args.size * 1024 * 1024
+    if not source_fits and source_bitrate_kbps and clip_duration < duration:
+        # A trimmed slice can fit even when the whole file does not; estimate
+        # its size from the container bitrate with 5% slack for keyframe snap.
+        est_bytes = source_bitrate_kbps * 1000 / 8 * clip_duration
+        source_fits = est_bytes * 1.05 <= args.size * 1024 * 1024
+    if not args.force_reencode and not wants_transform and source_fits:
+        audio_codecs = {s.get("codec_name") for s in audio}
+        webm_safe = video_codec in ("vp8", "vp9", "av1") and (
+            args.mute or not audio_codecs or audio_codecs <= {"opus", "vorbis"}
+        )
+        if webm_safe or not out_path.lower().endswith(".webm"):
+            cmd = ["ffmpeg", "-hide_banner", "-y", "-nostdin"]
+            seg_start, seg_end = segments[0]
+            if seg_start > 0:
+                cmd.extend(["-ss", f"{seg_start:.3f}"])
+            if seg_end < duration:
+                cmd.extend(["-to", f"{seg_end:.3f}"])
+            cmd.extend(["-i", args.input_file, "-c", "copy"])
+            if args.mute:
+                cmd.append("-an")
+            if args.keep_metadata:
+                cmd.extend(["-map_metadata", "0"])
+            cmd.append(out_path)
+
+            if args.print_mode:
+                print(f"\n# Stream-copy command:\n{shlex.join(cmd)}")
+                return
+            print(
+                ">>> Info: Source already fits the target size; stream-copying "
+                "without re-encoding (--force-reencode to override)."
+            )
+            if seg_start > 0:
+                print(">>> Warning: Stream-copy cuts snap to the nearest keyframe.")
+            try:
+                subprocess.run(
+                    cmd,
+                    check=True,
+                    creationflags=_creation_flags(args.cpu_priority),
+                    **_SUBPROCESS_KWARGS,
+                )
+            except subprocess.CalledProcessError as e:
+                raise ScriptError(f"FFmpeg stream copy failed with exit code {e.returncode}")
+            return
+
+    # Chunked parallel encode: placed after the stream-copy check because a
+    # remux always beats N re-encodes when the source already fits.
+    if args.parallel_chunks and args.parallel_chunks > 1 and not args.print_mode:
+        _compress_in_parallel_chunks(args, segments, out_path, out_dir)
+        return
+
     # Subtitle Extraction and Shifting Engine
     adjusted_srt = None
     if args.hard_sub:
@@ -430,16 +1250,22 @@ def compress_video(**kwargs):
             "ffmpeg", "-hide_banner", "-y", "-i", args.input_file,
             "-map", "0:s:0", "-c:s", "srt", raw_srt
         ]
-        subprocess.run(ext_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(
+            ext_cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_SUBPROCESS_KWARGS,
+        )
 
         if not os.path.exists(raw_srt) or os.path.getsize(raw_srt) == 0:
-            if os.path.exists(raw_srt): os.remove(raw_srt)
+            with contextlib.suppress(OSError):
+                os.remove(raw_srt)
             raise ScriptError("Failed to extract subtitles. Does the source have a text subtitle track at 0:s:0?")
 
         print(">>> Info: Slicing and synchronizing subtitles to match segments...")
         slice_and_shift_srt(raw_srt, adjusted_srt, segments)
 
-        if os.path.exists(raw_srt):
+        with contextlib.suppress(OSError):
             os.remove(raw_srt)
 
     # Native Filter Complex Graph Construction for multi-segment slicing
@@ -450,31 +1276,53 @@ def compress_video(**kwargs):
     has_audio = len(audio) > 0
     is_audio_enabled = not (args.mute or not has_audio)
 
-    if len(segments) > 1:
-        concat_nodes = ""
-        f_parts = []
-        for i, (st, en) in enumerate(segments):
-            f_parts.append(f"[0:v]trim=start={st:.3f}:end={en:.3f},setpts=PTS-STARTPTS[v{i}]")
-            if is_audio_enabled:
-                f_parts.append(f"[0:a]atrim=start={st:.3f}:end={en:.3f},asetpts=PTS-STARTPTS[a{i}]")
-                concat_nodes += f"[v{i}][a{i}]"
-            else:
-                concat_nodes += f"[v{i}]"
+    # Audio must be tempo-adjusted to match the video's setpts change;
+    # computed once here, consumed by both passes.
+    atempo_filter = None
+    if args.speed != 1.0 and is_audio_enabled:
+        atempo_filter = _atempo_chain(args.speed)
 
-        c_ext = f":a=1[vseg][aseg]" if is_audio_enabled else ":a=0[vseg]"
-        f_parts.append(f"{concat_nodes}concat=n={len(segments)}:v=1{c_ext}")
-        filter_complex = ";".join(f_parts)
+    filter_complex_video = None
+    if len(segments) > 1:
+        filter_complex = build_concat_filter(segments, is_audio_enabled)
+        filter_complex_video = (
+            build_concat_filter(segments, False) if is_audio_enabled else filter_complex
+        )
         video_map = "[vseg]"
         audio_map = "[aseg]" if is_audio_enabled else None
+        if atempo_filter and is_audio_enabled:
+            # Filtergraph-mapped streams cannot take -filter:a; extend the graph.
+            filter_complex += f";[aseg]{atempo_filter}[afinal]"
+            audio_map = "[afinal]"
 
     # Bitrate Calculation & Audio Evaluation
     total_br, video_br = calculate_bitrates(
-        args.size, effective_duration, args.audio_bitrate, is_audio_enabled
+        args.size, effective_duration, args.audio_bitrate, is_audio_enabled,
+        source_bitrate_kbps=source_bitrate_kbps,
     )
 
-    safe_name = "".join(c if c.isalnum() else "_" for c in os.path.basename(out_path))
-    log_name = f"passlog_{safe_name}_{timestamp}"
-    log_prefix = os.path.join(out_dir, log_name).replace("\\", "/")
+    # Clamp to a resolution-derived ceiling: a short clip at a huge target
+    # just wastes bits (and libvpx CPU) past the quality-saturation point.
+    if w and h:
+        out_w, out_h = w, h
+        if args.scale:
+            factor = args.scale / min(w, h)
+            out_w, out_h = w * factor, h * factor
+        ceiling_kbps = resolution_bitrate_ceiling(out_w, out_h, args.fps or fps)
+        if video_br > ceiling_kbps:
+            print(
+                f">>> Warning: Video bitrate clamped to {ceiling_kbps:.0f}k "
+                f"({out_w:.0f}x{out_h:.0f} ceiling; target allowed {video_br:.0f}k). "
+                "Output will be under the target size."
+            )
+            video_br = ceiling_kbps
+
+    # Pass logs are write-once/read-once scratch data: keep them in a private
+    # temp dir (tmpfs on most Linux setups) instead of next to the output,
+    # which may sit on a spinning disk or network share. mkdtemp also
+    # guarantees uniqueness across concurrent batch workers.
+    log_dir = tempfile.mkdtemp(prefix="py100mbify_")
+    log_prefix = os.path.join(log_dir, "passlog").replace("\\", "/")
 
     cfg = {
         "segments": segments,
@@ -488,11 +1336,26 @@ def compress_video(**kwargs):
         "log_prefix": log_prefix,
         "out_path": out_path,
         "filter_complex": filter_complex,
+        "filter_complex_video": filter_complex_video,
         "video_map": video_map,
         "audio_map": audio_map,
         "adjusted_srt": adjusted_srt,
+        "atempo_filter": atempo_filter,
         "has_audio": has_audio,
     }
+    # Opus sources within the audio budget can be stream-copied: same codec
+    # out as in, so re-encoding would only burn CPU and a generation loss.
+    if is_audio_enabled and not atempo_filter and not filter_complex:
+        src_audio_kbps = float(audio[0].get("bit_rate") or 0) / 1000
+        cfg["audio_copy"] = (
+            audio[0].get("codec_name") == "opus"
+            and 0 < src_audio_kbps <= args.audio_bitrate
+        )
+    else:
+        cfg["audio_copy"] = False
+    # Built once: the chain is identical for both passes, and building it here
+    # keeps its Info/Warning prints from repeating per pass.
+    cfg["v_filters"] = build_video_filters(args, cfg)
 
     # Build Dynamic Info Strings
     fps_display = f"{fps:.2f} FPS" + (" (VFR detected)" if is_vfr else " (CFR)")
@@ -514,10 +1377,11 @@ def compress_video(**kwargs):
     if args.mute or not has_audio: overrides.append("Audio: Muted/None")
     if args.hard_sub: overrides.append("Hard-subs: Enabled")
     if args.proto: overrides.append(f"Mode: Prototype (CRF {args.proto})")
+    elif args.single_pass: overrides.append("Mode: Single Pass (constrained VBR)")
 
     header = [
         f"Py100mbify Session Started: {start_timestamp}",
-        f"Input: {os.path.basename(args.input_file)} ({duration:.2f}s raw)",
+        f"Input: {input_name} ({duration:.2f}s raw)",
         f"Clip Duration: {effective_duration:.2f}s",
         f"Source: {w}x{h} @ {fps_display}",
         f"Target Size: {args.size} MiB",
@@ -531,32 +1395,112 @@ def compress_video(**kwargs):
     header.append("-" * 40)
     print("\n".join(header))
 
+    # Pass-1 stats cache: a size sweep over the same clip and filters can
+    # skip the analysis pass entirely. Keyed on the original input, so it is
+    # resolved before the pre-filter below rebinds args.input_file. Set
+    # PY100MBIFY_NO_STATS_CACHE to opt out.
+    stats_cache_file = None
+    if (
+        not args.proto and not args.single_pass and not args.print_mode
+        and not os.environ.get("PY100MBIFY_NO_STATS_CACHE")
+    ):
+        try:
+            stats_cache_file = _stats_cache_path(args, segments)
+        except OSError:
+            pass
+
+    # Opt-in pre-filter: render the filter chain once to a lossless
+    # intermediate so the two encoding passes skip the decode/filter work.
+    # Only worthwhile for two-pass jobs with actual transforms, and the
+    # concat graph path keeps its own filter routing.
+    prefilter_file = None
+    if (
+        os.environ.get("PY100MBIFY_PREFILTER")
+        and not args.proto
+        and not args.single_pass
+        and not args.print_mode
+        and not filter_complex
+        and (
+            args.scale or args.fps or args.rotate or args.hard_sub
+            or args.speed != 1.0 or args.prepend_filters or args.append_filters
+        )
+    ):
+        prefilter_file = _prefilter_to_tempfile(args, cfg, out_dir, timestamp)
+        # Both passes now read pre-trimmed, pre-filtered frames.
+        args.input_file = prefilter_file
+        args.scale = args.fps = args.rotate = None
+        args.speed = 1.0
+        args.hard_sub = False
+        args.prepend_filters = args.append_filters = None
+        cfg["segments"] = [(0.0, effective_duration)]
+        cfg["raw_duration"] = effective_duration
+        cfg["atempo_filter"] = None
+        cfg["v_filters"] = []
+        # The intermediate's audio is pcm_s16le, not the source Opus stream
+        # the copy decision was based on; it must be re-encoded.
+        cfg["audio_copy"] = False
+
     try:
         if args.proto:
             run_ffmpeg_pass(1, args, cfg)
+        elif args.single_pass:
+            run_ffmpeg_pass(2, args, cfg)
         else:
-            run_ffmpeg_pass(1, args, cfg)
+            pass_log = f"{log_prefix}-0.log"
+            # x264 with mbtree writes a second stats file next to the log;
+            # a hit that restores only the log would fail Pass 2 there.
+            sidecars = [".mbtree"] if args.codec == "x264" else []
+            cache_hit = (
+                stats_cache_file
+                and os.path.exists(stats_cache_file)
+                and all(os.path.exists(stats_cache_file + ext) for ext in sidecars)
+            )
+            if cache_hit:
+                print(">>> Info: Reusing cached analysis stats; skipping Pass 1.")
+                shutil.copyfile(stats_cache_file, pass_log)
+                for ext in sidecars:
+                    shutil.copyfile(stats_cache_file + ext, pass_log + ext)
+            else:
+                run_ffmpeg_pass(1, args, cfg)
+                if (
+                    stats_cache_file
+                    and os.path.exists(pass_log)
+                    and all(os.path.exists(pass_log + ext) for ext in sidecars)
+                ):
+                    try:
+                        os.makedirs(STATS_CACHE_DIR, exist_ok=True)
+                        for ext in [""] + sidecars:
+                            tmp_path = f"{stats_cache_file}{ext}.{os.getpid()}.tmp"
+                            shutil.copyfile(pass_log + ext, tmp_path)
+                            os.replace(tmp_path, stats_cache_file + ext)
+                        _prune_stats_cache()
+                    except OSError:
+                        pass
             run_ffmpeg_pass(2, args, cfg)
     finally:
         # Secure cleanup logic for all temp encoder log targets
+        shutil.rmtree(log_dir, ignore_errors=True)
+
         cleanup_files = []
-        if not args.proto:
-            cleanup_files.extend([f"{log_prefix}-0.log", f"{log_prefix}-0.log.temp"])
         if cfg.get("adjusted_srt"):
             cleanup_files.append(cfg["adjusted_srt"])
+        if prefilter_file:
+            cleanup_files.append(prefilter_file)
 
         for f in cleanup_files:
-            if os.path.exists(f):
-                try:
-                    os.remove(f)
-                except OSError:
-                    pass
+            with contextlib.suppress(OSError):
+                os.remove(f)
 
     # Post-Encoding Analysis
-    if not args.print_mode and os.path.exists(out_path):
+    try:
+        out_size_bytes = os.stat(out_path).st_size if not args.print_mode else None
+    except OSError:
+        out_size_bytes = None
+
+    if out_size_bytes is not None:
         end_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         total_elapsed = time.time() - script_start_time
-        final_size = os.path.getsize(out_path) / (1024 * 1024)
+        final_size = out_size_bytes / (1024 * 1024)
 
         # Calculate encoding efficiency (x-speed)
         # e.g. 1.00x is real-time, 0.5x is half real-time
@@ -581,7 +1525,7 @@ def compress_video(**kwargs):
         try:
             with open("py100mbify_history.log", "a", encoding="utf-8") as f:
                 f.write(
-                    f"[{start_timestamp}] COMPLETED: {os.path.basename(args.input_file)} "
+                    f"[{start_timestamp}] COMPLETED: {input_name} "
                     f"(Segments: {len(segments)}) "
                     f"-> {final_size:.2f}MB in {str(timedelta(seconds=int(total_elapsed)))} "
                     f"({speed_ratio:.2f}x)\n"
@@ -609,6 +1553,10 @@ def sanitize_input_args(args):
 
 
 def main():
+    # Imported here so library users of compress_video skip argparse's
+    # ~15ms cold-start cost; only the CLI entry point needs it.
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="py100mbify",
         description="Py100mbify: A high-precision VP9/WebM target-size compressor for Discord and web sharing.",
@@ -617,11 +1565,16 @@ def main():
     )
 
     # --- Positionals ---
-    parser.add_argument("input_file", help="Path to the source video file.")
+    parser.add_argument(
+        "input_file",
+        nargs="+",
+        help="Path to the source video file(s). Multiple inputs are encoded in parallel.",
+    )
     parser.add_argument(
         "output_file",
         nargs="?",
-        help="Output path. Defaults to [input_filename].webm in the CURRENT working directory.",
+        help="Output path (single input only). Defaults to [input_filename].webm "
+        "in the CURRENT working directory.",
     )
 
     # --- Target Constraints ---
@@ -701,6 +1654,18 @@ def main():
         action="store_true",
         help="Copy global metadata from source to output.",
     )
+    quality_group.add_argument(
+        "--codec",
+        choices=["vp9", "av1-svt", "av1-aom", "x264", "hevc-nvenc", "vp9-vaapi"],
+        default="vp9",
+        help="Video encoder. Non-VP9 codecs default to a .mkv output container; "
+        "the hardware encoders (nvenc/vaapi) are single-pass only.",
+    )
+    quality_group.add_argument(
+        "--quality",
+        choices=["best", "good", "realtime"],
+        help="libvpx deadline. Defaults to PY100MBIFY_QUALITY or 'good'.",
+    )
     quality_group.add_argument(
         "--prepend-filters",
         metavar="STR",
@@ -719,6 +1684,80 @@ def main():
         choices=["low", "high"],
         help="Set process niceness (requires psutil on Windows).",
     )
+    exec_group.add_argument(
+        "--force-reencode",
+        action="store_true",
+        help="Always re-encode, even when the source already fits the target size.",
+    )
+    exec_group.add_argument(
+        "--hwaccel",
+        choices=["auto", "none", "cuda", "vaapi", "videotoolbox", "qsv"],
+        default="none",
+        help="Hardware-accelerated decoding of the input (encoding stays software).",
+    )
+    exec_group.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="Skip the analysis pass and use constrained VBR. Roughly twice as "
+        "fast, at the cost of exact-size accuracy.",
+    )
+    exec_group.add_argument(
+        "--crf",
+        type=int,
+        metavar="N",
+        help="Constrained-quality single pass: CRF floor with the target bitrate "
+        "as cap. Implies --single-pass.",
+    )
+    exec_group.add_argument(
+        "--threads",
+        type=int,
+        metavar="N",
+        help="Encoder thread count. Defaults to PY100MBIFY_THREADS or the CPU count.",
+    )
+    exec_group.add_argument(
+        "--speed-pass1",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "libvpx -speed for the analysis pass (higher is faster). "
+            f"Defaults to PY100MBIFY_PASS1_SPEED or {DEFAULT_SPEED_PASS1}."
+        ),
+    )
+    exec_group.add_argument(
+        "--speed-pass2",
+        type=int,
+        default=DEFAULT_SPEED_PASS2,
+        metavar="N",
+        help="libvpx -speed for the final encoding pass (lower is higher quality).",
+    )
+    exec_group.add_argument(
+        "--min-twopass",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Clips shorter than this automatically use --single-pass. "
+        "0 disables the shortcut and keeps exact-size two-pass everywhere.",
+    )
+    exec_group.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress ffmpeg's stderr chatter and per-decile progress lines.",
+    )
+    exec_group.add_argument(
+        "--fast-probe",
+        action="store_true",
+        help="Minimize ffmpeg's input analysis before each pass. Safe for "
+        "well-formed local files; avoid on streams with odd headers.",
+    )
+    exec_group.add_argument(
+        "--parallel-chunks",
+        type=int,
+        metavar="N",
+        help="Split the clip into N time slices, encode them concurrently and "
+        "concatenate. Near-linear speedup on long inputs, with a small "
+        "efficiency loss at chunk boundaries.",
+    )
     exec_group.add_argument(
         "--proto",
         nargs="?",
@@ -733,12 +1772,52 @@ def main():
         action="store_true",
         help="Print the FFmpeg commands to console instead of running them.",
     )
+    exec_group.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat every positional path as an input to encode. Required to "
+        "batch exactly two files, which otherwise parse as INPUT OUTPUT.",
+    )
 
     clean_sys_argv = sanitize_input_args(sys.argv[1:])
     args = parser.parse_args(clean_sys_argv)
 
+    kwargs = vars(args)
+    input_files = kwargs.pop("input_file")
+    batch_mode = kwargs.pop("batch")
+
+    # argparse's greedy '+' consumes the classic "INPUT OUTPUT" pair into
+    # input_file; two paths always mean INPUT OUTPUT (the second existing on
+    # disk is the normal overwrite case, not a second input). Batching exactly
+    # two files requires --batch; three or more are always a batch.
+    if len(input_files) == 2 and not kwargs.get("output_file") and not batch_mode:
+        input_files, kwargs["output_file"] = input_files[:1], input_files[1]
+
     try:
-        compress_video(**vars(args))
+        if len(input_files) == 1:
+            compress_video(input_file=input_files[0], **kwargs)
+        else:
+            if kwargs.get("output_file"):
+                raise ScriptError(
+                    "An explicit output_file cannot be combined with multiple inputs."
+                )
+            # Bound workers so aggregate encoder threads roughly match cores.
+            threads = resolve_thread_count(kwargs.get("threads"))
+            max_workers = max(1, (os.cpu_count() or 4) // threads)
+            failures = []
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(compress_video, input_file=f, **kwargs): f
+                    for f in input_files
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except ScriptError as e:
+                        failures.append(futures[future])
+                        print(f"\nError ({futures[future]}): {e}", file=sys.stderr)
+            if failures:
+                raise ScriptError(f"{len(failures)} of {len(input_files)} inputs failed.")
     except ScriptError as e:
         print(f"\nError: {e}", file=sys.stderr)
         sys.exit(1)
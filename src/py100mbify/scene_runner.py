@@ -5,54 +5,132 @@ import argparse
 import csv
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from types import MappingProxyType
 # Import necessary constants and functions for logic
-from py100mbify import compress_video, ScriptError, DEFAULT_TARGET_SIZE_MIB, DEFAULT_AUDIO_BITRATE_KBPS
+from py100mbify import compress_video, get_video_info, ScriptError, DEFAULT_TARGET_SIZE_MIB, DEFAULT_AUDIO_BITRATE_KBPS
 
 # Helper function to parse arguments that are specific to the runner script
 def parse_runner_args(argv=None):
     """
-    Parses arguments for the scene runner, leaving remaining arguments for compression.
+    Parses runner and compression arguments with a single parser/parse.
     """
-    # Create a dummy parser to handle only the scene_runner arguments
-    runner_parser = argparse.ArgumentParser(add_help=False)
-    runner_parser.add_argument('input_video', type=Path, help='The path to the original input video file.')
-    runner_parser.add_argument('scenes_csv', type=Path, help='The path to the SceneDetect CSV file.')
-    runner_parser.add_argument('--output-dir', type=Path, default=Path('./out_scenes'),
-                               help='Directory where compressed scene files will be saved (default: ./out_scenes).')
-    runner_parser.add_argument('--print', action='store_true',
-                               help='Do not run FFmpeg. Instead, print the py100mbify command for each scene to stdout.')
-
-    # Parse only known arguments for the runner
-    runner_args, remaining_args = runner_parser.parse_known_args(argv)
-
-    # Now create the final parser for the compression arguments, reusing the runner_parser arguments
-    compress_parser = argparse.ArgumentParser(
-        parents=[runner_parser],
+    parser = argparse.ArgumentParser(
         description='Compresses multiple scenes from a video based on a SceneDetect CSV.',
         epilog='All arguments not listed above (like --size, --scale, --rotate, etc.) are passed directly to compress_video for each scene.'
     )
 
-    # We re-add the most common py100mbify arguments for proper help text
-    compress_parser.add_argument('--size', type=int, default=DEFAULT_TARGET_SIZE_MIB,
-                                 help=f'Target output size in MiB for *each* scene (default: {DEFAULT_TARGET_SIZE_MIB}).')
-    compress_parser.add_argument('--audio-bitrate', type=int, default=DEFAULT_AUDIO_BITRATE_KBPS,
-                                 help=f'Target audio bitrate in kbps (default: {DEFAULT_AUDIO_BITRATE_KBPS}).')
-    compress_parser.add_argument('--mute', action='store_true', help='Mute the audio track for all scenes.')
-    compress_parser.add_argument('--speed', type=float, default=1.0, help='Video playback speed for all scenes.')
-    compress_parser.add_argument('--scale', type=int, default=None, help='The target size for the video\'s smallest dimension.')
-    compress_parser.add_argument('--rotate', type=float, default=None, help='Rotate the video by degrees.')
-    compress_parser.add_argument('--keep-metadata', action='store_true', help='Keep original metadata.')
-    compress_parser.add_argument('--cpu-priority', choices=['low', 'high'], help='Set FFmpeg process CPU priority.')
-    compress_parser.add_argument('--proto', action='store_true',
-                                 help='Prototype mode: Use fast, low-quality single-pass CRF encoding to quickly test clipping accuracy.')
-    compress_parser.add_argument('--fps', type=int, help='(Optional) Set a target frame rate (e.g., 30).')
-    compress_parser.add_argument('--prepend-filters', help='(Optional) FFmpeg filters to apply before standard filters.')
-    compress_parser.add_argument('--append-filters', help='(Optional) FFmpeg filters to apply after standard filters.')
-
-    # Final comprehensive parse to ensure all arguments are captured in one object
-    final_args = compress_parser.parse_args(argv)
-    return final_args
+    # Runner-specific arguments
+    parser.add_argument('input_video', type=Path, help='The path to the original input video file.')
+    parser.add_argument('scenes_csv', type=Path, help='The path to the SceneDetect CSV file.')
+    parser.add_argument('--output-dir', type=Path, default=Path('./out_scenes'),
+                        help='Directory where compressed scene files will be saved (default: ./out_scenes).')
+    parser.add_argument('--print', action='store_true',
+                        help='Do not run FFmpeg. Instead, print the py100mbify command for each scene to stdout.')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Do not run FFmpeg. Instead, print the computed FFmpeg command(s) for each scene to stdout.')
+    parser.add_argument('--emit-script', type=Path, default=None, metavar='PATH',
+                        help='Write the py100mbify command for each scene to PATH as a shell script instead of encoding.')
+    parser.add_argument('--parallel-scenes', type=int, default=1, metavar='N',
+                        help='Encode up to N scenes concurrently in worker processes (default: 1).')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-encode scenes even when their output file already exists (default: skip them).')
+
+    # The most common py100mbify arguments, forwarded to compress_video
+    parser.add_argument('--size', type=int, default=DEFAULT_TARGET_SIZE_MIB,
+                        help=f'Target output size in MiB for *each* scene (default: {DEFAULT_TARGET_SIZE_MIB}).')
+    parser.add_argument('--audio-bitrate', type=int, default=DEFAULT_AUDIO_BITRATE_KBPS,
+                        help=f'Target audio bitrate in kbps (default: {DEFAULT_AUDIO_BITRATE_KBPS}).')
+    parser.add_argument('--mute', action='store_true', help='Mute the audio track for all scenes.')
+    parser.add_argument('--speed', type=float, default=1.0, help='Video playback speed for all scenes.')
+    parser.add_argument('--scale', type=int, default=None, help='The target size for the video\'s smallest dimension.')
+    parser.add_argument('--rotate', type=float, default=None, help='Rotate the video by degrees.')
+    parser.add_argument('--keep-metadata', action='store_true', help='Keep original metadata.')
+    parser.add_argument('--cpu-priority', choices=['low', 'high'], help='Set FFmpeg process CPU priority.')
+    parser.add_argument('--proto', action='store_true',
+                        help='Prototype mode: Use fast, low-quality single-pass CRF encoding to quickly test clipping accuracy.')
+    parser.add_argument('--fps', type=int, help='(Optional) Set a target frame rate (e.g., 30).')
+    parser.add_argument('--prepend-filters', help='(Optional) FFmpeg filters to apply before standard filters.')
+    parser.add_argument('--append-filters', help='(Optional) FFmpeg filters to apply after standard filters.')
+
+    return parser.parse_args(argv)
+
+def _iter_scenes(reader):
+    """Yields (scene_number, start_sec, end_sec, start_str, end_str) rows
+    with one-row lookahead.
+
+    Streams the CSV instead of materializing it: each scene's end time is the
+    next scene's start so contiguous scenes stay gapless, and only the final
+    row's own end time is used. Takes a plain csv.reader and resolves the
+    column indices from the header once, avoiding a dict allocation per row.
+    The millisecond strings FFmpeg receives are formatted here so a shared
+    boundary is converted once, not once as an end and again as a start.
+    """
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+        num_idx = header.index('Scene Number')
+        start_idx = header.index('Start Time (seconds)')
+        end_idx = header.index('End Time (seconds)')
+        prev = None
+        prev_start = 0.0
+        prev_start_str = ''
+        for row in reader:
+            start = float(row[start_idx])
+            start_str = format(start, '.3f')
+            if prev is not None:
+                yield prev[num_idx], prev_start, start, prev_start_str, start_str
+            prev = row
+            prev_start = start
+            prev_start_str = start_str
+        if prev is not None:
+            end = float(prev[end_idx])
+            yield prev[num_idx], prev_start, end, prev_start_str, format(end, '.3f')
+    except (csv.Error, ValueError, IndexError) as e:
+        # Unexpected headers (e.g. PySceneDetect's leading "Timecode List"
+        # row) or non-numeric fields should not surface as a raw traceback.
+        raise ScriptError(
+            f"Error reading or parsing CSV file. Expected SceneDetect columns "
+            f"'Scene Number', 'Start Time (seconds)', 'End Time (seconds)'.\nDetails: {e}"
+        )
+
+
+def _encode_scene(scene_label, scene_kwargs):
+    """Encodes one scene in the current process.
+
+    Returns (scene_label, size_mib, error): size_mib is None on failure.
+    Module-level so ProcessPoolExecutor can pickle it for worker processes.
+    Encodes to a '.part' name and renames into place on success, so a file
+    at the final path is always a completed scene (a killed ffmpeg leaves
+    only the .part behind) and the skip-existing rerun check stays safe.
+    """
+    root, ext = os.path.splitext(scene_kwargs['output_file'])
+    part_file = f"{root}.part{ext}"
+    try:
+        compress_video(**dict(scene_kwargs, output_file=part_file))
+    except ScriptError as e:
+        try:
+            os.remove(part_file)
+        except OSError:
+            pass
+        return scene_label, None, str(e)
+    try:
+        size_mib = os.stat(part_file).st_size / (1024 * 1024)
+    except OSError:
+        return scene_label, None, 'output file was not created'
+    os.replace(part_file, scene_kwargs['output_file'])
+    return scene_label, size_mib, None
+
+
+def _report_scene(scene_label, size_mib, error):
+    """Prints the per-scene outcome line."""
+    if size_mib is not None:
+        print(f"Scene {scene_label} SUCCESS: {size_mib:.2f} MiB")
+    else:
+        print(f"Scene {scene_label} FAILED: {error}")
+
 
 def run_scene_compression():
     """
@@ -66,41 +144,41 @@ def run_scene_compression():
     input_file = args.input_video
     csv_file = args.scenes_csv
     output_dir = args.output_dir
+    # Convert the input path once; PurePath.__fspath__ would otherwise run
+    # for every scene in the loop below.
+    input_file_str = os.fspath(input_file)
 
-    # Check input video existence first
-    if not input_file.exists():
+    # Check both inputs with one stat syscall each (Path.exists() stats too,
+    # but this also fails on the CSV before any probing/encoding starts).
+    try:
+        os.stat(input_file_str)
+    except OSError:
         sys.stderr.write(f"Error: Input video file not found at '{input_file}'.\n")
         sys.exit(1)
-
     try:
-        # Use explicit UTF-8 encoding. This is critical for reliable reading of files
-        # with non-ASCII characters in their name or content, especially on Windows/uv.
-        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            scenes_data = list(reader)
-    except FileNotFoundError as e:
-        sys.stderr.write(f"Error: Scenes CSV file not found at '{csv_file}'. Ensure the path is correct.\nDetails: {e}\n")
-        sys.exit(1)
-    except Exception as e:
-        sys.stderr.write(f"Error reading or parsing CSV file. This may be due to complex paths or encoding issues on Windows.\nDetails: {e}\n")
+        os.stat(csv_file)
+    except OSError:
+        sys.stderr.write(f"Error: Scenes CSV file not found at '{csv_file}'. Ensure the path is correct.\n")
         sys.exit(1)
 
-    if not scenes_data:
-        sys.stderr.write("No scenes found in the CSV file.\n")
-        return
+    # In these modes commands are shown/written rather than executed.
+    command_mode = args.print or args.emit_script is not None
 
     # Create output directory only if we are actually encoding
-    if not args.print:
+    if not (command_mode or args.dry_run):
         output_dir.mkdir(exist_ok=True)
 
 
     # --- 1. Reconstruct common command line arguments ---
     common_args_list = []
 
+    # Frame-accurate cuts for printed/emitted commands too (see common_kwargs).
+    common_args_list.append('--force-reencode')
+
     # Iterate through all arguments passed to scene_runner.py
     for key, value in vars(args).items():
         # Skip internal runner args
-        if key in ['input_video', 'scenes_csv', 'output_dir', 'print']:
+        if key in ['input_video', 'scenes_csv', 'output_dir', 'print', 'dry_run', 'emit_script', 'parallel_scenes', 'force']:
             continue
 
         arg_name = f'--{key.replace("_", "-")}'
@@ -136,101 +214,179 @@ def run_scene_compression():
 
     # --- 2. Process Scenes (Print or Run) ---
 
-    start_times = [float(row['Start Time (seconds)']) for row in scenes_data]
-
-    if not args.print:
+    if not command_mode:
         print(f"--- Starting Multi-Scene Compression ---\n"
               f"Input Video: {input_file.name}\n"
-              f"Scenes Found: {len(scenes_data)}\n"
               f"Output Directory: {output_dir.resolve()}")
         if args.proto:
              print("WARNING: Running in PROTO Mode. Output quality will be low but encoding will be fast.")
         print("----------------------------------------")
 
 
-    for i, scene in enumerate(scenes_data):
-        scene_number_raw = scene['Scene Number']
+    parallel = max(1, args.parallel_scenes)
+    pending = []
+    scene_count = 0
+
+    # Output-name pieces that never change between scenes
+    base_name = input_file.stem
+    proto_suffix = "-PROTO" if args.proto else ""
+
+    # Probe once: the source metadata is identical for every scene, so each
+    # compress_video call gets the tuple instead of re-running ffprobe.
+    video_info = None if command_mode else get_video_info(input_file_str)
+
+    # Everything except the trim window and output path is scene-invariant.
+    common_kwargs = dict(
+        input_file=input_file_str,
+        size=args.size,
+        audio_bitrate=args.audio_bitrate,
+        mute=args.mute,
+        speed=args.speed,
+        fps=args.fps,
+        scale=args.scale,
+        cpu_priority=args.cpu_priority,
+        prepend_filters=args.prepend_filters,
+        append_filters=args.append_filters,
+        rotate=args.rotate,
+        keep_metadata=args.keep_metadata,
+        proto=args.proto,
+        # Scene cuts must be frame-accurate: the trimmed stream-copy fast
+        # path snaps to keyframes (seconds of drift at keyint 150), and with
+        # a generous per-scene --size nearly every slice would qualify.
+        force_reencode=True,
+        video_info=video_info,
+        # --dry-run still probes and computes bitrates per scene, but
+        # compress_video only prints its FFmpeg command(s) in this mode.
+        print_mode=args.dry_run,
+        # Concurrent workers would interleave ffmpeg chatter and per-decile
+        # progress lines through one terminal; keep them quiet.
+        quiet=parallel > 1,
+    )
+    if parallel > 1:
+        # Split the encoder threads across workers so the aggregate roughly
+        # matches the core count instead of oversubscribing N-fold.
+        common_kwargs['threads'] = max(1, (os.cpu_count() or 4) // parallel)
+    # Freeze it: the same mapping is reused for every scene submission, and a
+    # stray per-scene mutation would silently leak into later scenes.
+    common_kwargs = MappingProxyType(common_kwargs)
 
-        try:
-            scene_num_int = int(scene_number_raw)
-            # Format scene number with 3 leading zeros (S001, S010, S123)
-            formatted_scene_number = f'{scene_num_int:03d}'
-        except ValueError:
-            formatted_scene_number = scene_number_raw
+    try:
+        # Use explicit UTF-8 encoding. This is critical for reliable reading of files
+        # with non-ASCII characters in their name or content, especially on Windows/uv.
+        csv_handle = open(csv_file, 'r', newline='', encoding='utf-8')
+    except FileNotFoundError as e:
+        sys.stderr.write(f"Error: Scenes CSV file not found at '{csv_file}'. Ensure the path is correct.\nDetails: {e}\n")
+        sys.exit(1)
 
-        start_time_sec = start_times[i]
+    # --emit-script collects the same lines --print would show into a shell
+    # script, one scene per line, runnable as-is or under e.g. GNU parallel.
+    emit_handle = None
+    if args.emit_script is not None:
+        emit_handle = open(args.emit_script, 'w', encoding='utf-8')
+        emit_handle.write("#!/bin/sh\n")
 
-        # Calculate End Time: Use the start time of the next scene or the end of the video
-        if i + 1 < len(start_times):
-            end_time_sec = start_times[i+1]
-        else:
-            end_time_sec = float(scene['End Time (seconds)'])
+    with csv_handle:
+        for scene_number_raw, start_time_sec, end_time_sec, start_time_str, end_time_str in _iter_scenes(csv.reader(csv_handle)):
+            scene_count += 1
 
-        clip_duration_sec = end_time_sec - start_time_sec
+            try:
+                scene_num_int = int(scene_number_raw)
+                # Format scene number with 3 leading zeros (S001, S010, S123)
+                formatted_scene_number = f'{scene_num_int:03d}'
+            except ValueError:
+                formatted_scene_number = scene_number_raw
 
-        # Format times for FFmpeg
-        start_time_str = f"{start_time_sec:.3f}"
-        end_time_str = f"{end_time_sec:.3f}"
+            clip_duration_sec = end_time_sec - start_time_sec
 
-        # Construct output filename: [INPUT_BASE]-S[SCENE_NUM].webm
-        base_name = input_file.stem
-        proto_suffix = "-PROTO" if args.proto else ""
-        output_file_name = f"{base_name}-S{formatted_scene_number}{proto_suffix}.webm"
-        output_path = output_dir / output_file_name
+            # Construct output filename: [INPUT_BASE]-S[SCENE_NUM].webm
+            output_path = output_dir / f"{base_name}-S{formatted_scene_number}{proto_suffix}.webm"
 
 
-        if args.print:
-            # --- PRINT COMMAND MODE ---
-            # Command starts with 'py100mbify' (assumed executable name)
-            command = ['py100mbify']
+            if command_mode:
+                # --- PRINT / EMIT-SCRIPT COMMAND MODE ---
+                # Command starts with 'py100mbify' (assumed executable name)
+                command = ['py100mbify']
 
-            # Input file and output path must be quoted for shell safety.
-            # Use os.fspath() for robust string representation of pathlib.Path objects.
-            command.append(f'"{os.fspath(input_file)}"')
-            command.append(f'"{os.fspath(output_path)}"')
+                # Input file and output path must be quoted for shell safety.
+                # Use os.fspath() for robust string representation of pathlib.Path objects.
+                command.append(f'"{input_file_str}"')
+                command.append(f'"{os.fspath(output_path)}"')
 
-            # Scene-specific trim arguments
-            command.extend(['--start', start_time_str])
-            command.extend(['--end', end_time_str])
+                # Scene-specific trim arguments
+                command.extend(['--start', start_time_str])
+                command.extend(['--end', end_time_str])
 
-            # Append all common arguments
-            command.extend(common_args_list)
+                # Append all common arguments
+                command.extend(common_args_list)
 
-            # Print the final command line to stdout
-            print(' '.join(command))
+                # Write to the script file, or print the final line to stdout
+                if emit_handle is not None:
+                    emit_handle.write(' '.join(command) + '\n')
+                else:
+                    print(' '.join(command))
 
-        else:
-            # --- NORMAL EXECUTION MODE ---
-            print(f"\n========================================")
-            print(f"Processing Scene {formatted_scene_number} ({start_time_str}s for {clip_duration_sec:.3f}s)")
-            print(f"Output: {output_path.name}")
-            print(f"========================================")
-
-            # Note: all arguments are passed explicitly from args
-            final_output_file, final_size_mib = compress_video(
-                input_file=str(input_file),
-                output_file=str(output_path),
-                start=start_time_str,
-                end=end_time_str,
-                size=args.size,
-                audio_bitrate=args.audio_bitrate,
-                mute=args.mute,
-                speed=args.speed,
-                fps=args.fps,
-                scale=args.scale,
-                cpu_priority=args.cpu_priority,
-                prepend_filters=args.prepend_filters,
-                append_filters=args.append_filters,
-                rotate=args.rotate,
-                keep_metadata=args.keep_metadata,
-                proto=args.proto,
-                info_detail=False # Keep false to avoid redundant prints for every scene
-            )
-
-            if final_output_file:
-                print(f"Scene {formatted_scene_number} SUCCESS: {final_size_mib:.2f} MiB")
             else:
-                print(f"Scene {formatted_scene_number} FAILED.")
+                # --- NORMAL EXECUTION MODE ---
+                # Idempotent reruns: _encode_scene renames the output into
+                # place only after a successful encode, so a file at the
+                # final path is a finished scene (an interrupted run leaves
+                # only a .part file). Skip it unless --force is set.
+                if not args.force and not args.dry_run:
+                    try:
+                        existing_size = os.stat(output_path).st_size
+                    except OSError:
+                        existing_size = 0
+                    if existing_size > 0:
+                        print(f"Scene {formatted_scene_number} SKIPPED: "
+                              f"{output_path.name} already exists ({existing_size / (1024 * 1024):.2f} MiB).")
+                        continue
+
+                scene_kwargs = dict(
+                    common_kwargs,
+                    output_file=str(output_path),
+                    start=start_time_str,
+                    end=end_time_str,
+                )
+
+                if args.dry_run:
+                    # No output file is produced, so skip the encode/report
+                    # helpers; compress_video prints the commands itself.
+                    print(f"\n### Scene {formatted_scene_number} "
+                          f"({start_time_str}s for {clip_duration_sec:.3f}s)")
+                    compress_video(**scene_kwargs)
+                elif parallel > 1:
+                    print(f"Queued Scene {formatted_scene_number} "
+                          f"({start_time_str}s for {clip_duration_sec:.3f}s) -> {output_path.name}")
+                    pending.append((formatted_scene_number, scene_kwargs))
+                else:
+                    # One write instead of four: each print flushes (and
+                    # blocks) separately when stdout is a pipe or CI log.
+                    print(f"\n========================================\n"
+                          f"Processing Scene {formatted_scene_number} ({start_time_str}s for {clip_duration_sec:.3f}s)\n"
+                          f"Output: {output_path.name}\n"
+                          f"========================================")
+                    _report_scene(*_encode_scene(formatted_scene_number, scene_kwargs))
+
+    if emit_handle is not None:
+        emit_handle.close()
+        # Make the generated script directly runnable
+        os.chmod(args.emit_script, 0o755)
+        print(f">>> Wrote {scene_count} command(s) to {args.emit_script}")
+
+    if scene_count == 0:
+        sys.stderr.write("No scenes found in the CSV file.\n")
+        return
+
+    if pending:
+        print(f"\n>>> Encoding {len(pending)} scenes across {parallel} worker processes...")
+        with ProcessPoolExecutor(max_workers=parallel) as pool:
+            futures = [pool.submit(_encode_scene, label, kw) for label, kw in pending]
+            for future in as_completed(futures):
+                _report_scene(*future.result())
+
+    if not command_mode:
+        # The streaming reader only knows the total once the CSV is exhausted.
+        print(f"\n>>> Processed {scene_count} scene(s).")
 
 if __name__ == '__main__':
     try:
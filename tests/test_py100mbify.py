@@ -1,6 +1,6 @@
 import unittest
 # Importing the actual function name 'calculate_bitrates'
-from py100mbify import calculate_bitrates, get_time_in_seconds
+from py100mbify import calculate_bitrates, get_time_in_seconds, ScriptError, _atempo_chain
 # Note: Since the functions are in __init__.py, they are directly accessible via 'from py100mbify import ...'
 
 class TestPy100MbifyLogic(unittest.TestCase):
@@ -21,19 +21,33 @@ class TestPy100MbifyLogic(unittest.TestCase):
         # Empty input
         self.assertEqual(get_time_in_seconds(None), 0.0)
 
+    def test_atempo_chain(self):
+        """
+        Speeds within atempo's 0.5-2.0 range map to a single stage; others
+        decompose into doubling/halving stages plus a remainder.
+        """
+        self.assertEqual(_atempo_chain(1.5), "atempo=1.5")
+        self.assertEqual(_atempo_chain(4.0), "atempo=2.0,atempo=2.0")
+        self.assertEqual(_atempo_chain(5.0), "atempo=2.0,atempo=2.0,atempo=1.25")
+        self.assertEqual(_atempo_chain(0.2), "atempo=0.5,atempo=0.5,atempo=0.8")
+        with self.assertRaises(ScriptError):
+            _atempo_chain(0)
+
     def test_calculate_bitrates_no_audio(self):
         """
         Verifies bitrate calculation when audio is muted (0 kbps).
-        Formula: (Target MiB * 8192 - (Audio kbps * Duration)) / Duration
+        Formula: Target MiB * 8388.608 kbit / duration, less 1% container
+        overhead, floored to an integer kbps.
         """
         target_mib = 10
         duration_sec = 10.0
         audio_kbps = 0
 
-        # FIX: Unpack the result tuple, assuming video bitrate is the first element
-        # The *rest captures any other return values (like total bitrate)
-        video_bitrate, *rest = calculate_bitrates(duration_sec, target_mib, audio_kbps, False)
-        self.assertAlmostEqual(video_bitrate, 8192.0, places=1)
+        total_bitrate, video_bitrate = calculate_bitrates(
+            target_mib, duration_sec, audio_kbps, False
+        )
+        self.assertEqual(video_bitrate, 8304)
+        self.assertEqual(total_bitrate, video_bitrate)
 
     def test_calculate_bitrates_with_audio(self):
         """
@@ -43,24 +57,32 @@ class TestPy100MbifyLogic(unittest.TestCase):
         duration_sec = 10.0
         audio_kbps = 96
 
-        # Expected calculation: 8096.0 kbps
-        # FIX: Unpack the result tuple, checking only the video bitrate
-        video_bitrate, *rest = calculate_bitrates(duration_sec, target_mib, audio_kbps, True)
-        self.assertAlmostEqual(video_bitrate, 8096.0, places=1)
+        total_bitrate, video_bitrate = calculate_bitrates(
+            target_mib, duration_sec, audio_kbps, True
+        )
+        self.assertEqual(video_bitrate, total_bitrate - audio_kbps)
 
     def test_bitrate_too_low(self):
         """
-        Test case where the target size is too small, resulting in a video bitrate
-        lower than the minimum allowed (MIN_VIDEO_BITRATE_KBPS = 50).
+        A target size too small to fit a usable video stream (below
+        MIN_VIDEO_BITRATE_KBPS = 50) must raise instead of silently overshooting.
         """
         target_mib = 0.1
         duration_sec = 100.0
         audio_kbps = 96
 
-        # The function should return MIN_VIDEO_BITRATE_KBPS (50)
-        # FIX: Unpack the result tuple, checking only the video bitrate
-        video_bitrate, *rest = calculate_bitrates(duration_sec, target_mib, audio_kbps, True)
-        self.assertAlmostEqual(video_bitrate, 50.0, places=1)
+        with self.assertRaises(ScriptError):
+            calculate_bitrates(target_mib, duration_sec, audio_kbps, True)
+
+    def test_bitrate_capped_at_source(self):
+        """
+        The video bitrate must never exceed the source material's bitrate.
+        """
+        total_bitrate, video_bitrate = calculate_bitrates(
+            10, 10.0, 0, False, source_bitrate_kbps=2000
+        )
+        self.assertAlmostEqual(video_bitrate, 2000.0, places=1)
+        self.assertGreater(total_bitrate, video_bitrate)
 
 if __name__ == '__main__':
     unittest.main()